@@ -8,6 +8,7 @@ class TaskAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     list_filter = ('status', 'due_date')
     ordering = ('due_date',)
+    list_select_related = ('assigned_to',)
 
 
 @admin.register(Employee)
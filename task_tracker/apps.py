@@ -1,6 +1,25 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def configure_test_database(sender, connection, **kwargs):
+    """
+    Отключает ожидание записи на диск для тестовой базы SQLite, так как ее данные не нужно сохранять.
+    """
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous=OFF')
+            cursor.execute('PRAGMA journal_mode=MEMORY')
+            cursor.execute('PRAGMA temp_store=MEMORY')
 
 
 class TaskTrackerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_tracker'
+
+    def ready(self):
+        import task_tracker.signals  # noqa: F401
+
+        if settings.TESTING:
+            connection_created.connect(configure_test_database)
@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.utils.http import urlencode
+from rest_framework.response import Response
+
+# Номер версии кэша списков. При любом изменении задач или сотрудников он увеличивается,
+# и ранее сохраненные ответы перестают использоваться.
+LIST_CACHE_VERSION_KEY = 'task_tracker:list_cache_version'
+
+
+def get_list_cache_version():
+    """
+    Возвращает текущую версию кэша списков.
+    """
+    return cache.get_or_set(LIST_CACHE_VERSION_KEY, 1, None)
+
+
+def invalidate_list_cache():
+    """
+    Делает недействительными все закэшированные списки, увеличивая версию кэша.
+    """
+    try:
+        cache.incr(LIST_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(LIST_CACHE_VERSION_KEY, 1, None)
+
+
+class CachedListMixin:
+    """
+    Примесь для ListAPIView, которая кэширует ответ списка для пары «пользователь + параметры запроса».
+    Кэш сбрасывается сигналами при изменении задач и сотрудников, а также по истечении cache_timeout.
+    """
+    cache_timeout = 60
+
+    def get_list_cache_key(self, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        return f'task_tracker:list:{request.user.pk}:{request.path}?{query}'
+
+    def list(self, request, *args, **kwargs):
+        cache_key = self.get_list_cache_key(request)
+        version = get_list_cache_version()
+
+        data = cache.get(cache_key, version=version)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, self.cache_timeout, version=version)
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-15 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_tracker', '0004_remove_task_priority'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status'], name='task_tracke_assigne_5673f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['parent_task', 'assigned_to'], name='task_tracke_parent__f60209_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'due_date'], name='task_tracke_status_9f913e_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1 on 2026-10-15 06:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_active_task_count(apps, schema_editor):
+    Employee = apps.get_model('task_tracker', 'Employee')
+    Task = apps.get_model('task_tracker', 'Task')
+    active_task_count = Task.objects.filter(
+        assigned_to=OuterRef('pk'), status__in=['new', 'in_progress']
+    ).order_by().values('assigned_to').annotate(count=Count('pk')).values('count')
+    Employee.objects.update(active_task_count=Coalesce(Subquery(active_task_count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_tracker', '0005_task_task_tracke_assigne_5673f2_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='active_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text="Количество задач сотрудника в статусе 'Новая' или 'В работе'.", verbose_name='Количество активных задач'),
+        ),
+        migrations.RunPython(fill_active_task_count, migrations.RunPython.noop),
+    ]
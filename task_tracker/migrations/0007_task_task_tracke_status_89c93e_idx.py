@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-15 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_tracker', '0006_employee_active_task_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'parent_task'], name='task_tracke_status_89c93e_idx'),
+        ),
+    ]
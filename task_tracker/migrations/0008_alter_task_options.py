@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-15 07:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_tracker', '0007_task_task_tracke_status_89c93e_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['id'], 'verbose_name': 'Задача', 'verbose_name_plural': 'Задачи'},
+        ),
+    ]
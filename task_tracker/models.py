@@ -1,7 +1,11 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
 NULLABLE = {'blank': True, 'null': True}
 
+# Статусы задач, которые считаются активными: задача еще не взята в работу или выполняется
+ACTIVE_STATUSES = ('new', 'in_progress')
+
 
 class Employee(models.Model):
     """
@@ -15,24 +19,41 @@ class Employee(models.Model):
         position (CharField): Должность сотрудника.
         department (CharField): Отдел, в котором работает сотрудник.
         hired_date (DateField): Дата приема на работу.
+        active_task_count (PositiveIntegerField): Количество активных задач сотрудника,
+            поддерживается сигналами модели Task.
     """
-    last_name = models.CharField(max_length=30, verbose_name="Фамилия", help_text="Укажите фамилию сотрудника")
-    first_name = models.CharField(max_length=30, verbose_name="Имя", help_text="Укажите имя сотрудника")
-    middle_name = models.CharField(max_length=30, **NULLABLE, verbose_name="Отчество",
-                                   help_text="Укажите отчество сотрудника")
-    position = models.CharField(max_length=100, verbose_name="Должность", help_text="Укажите должность сотрудника.")
-    department = models.CharField(max_length=100, **NULLABLE, verbose_name="Отдел",
-                                  help_text="Укажите отдел сотрудника.")
-    hired_date = models.DateField(**NULLABLE, verbose_name="Дата приема на работу",
-                                  help_text="Укажите дату приема на работу.")
+    last_name = models.CharField(max_length=30, verbose_name=_("Фамилия"),
+                                 help_text=_("Укажите фамилию сотрудника"))
+    first_name = models.CharField(max_length=30, verbose_name=_("Имя"), help_text=_("Укажите имя сотрудника"))
+    middle_name = models.CharField(max_length=30, **NULLABLE, verbose_name=_("Отчество"),
+                                   help_text=_("Укажите отчество сотрудника"))
+    position = models.CharField(max_length=100, verbose_name=_("Должность"),
+                                help_text=_("Укажите должность сотрудника."))
+    department = models.CharField(max_length=100, **NULLABLE, verbose_name=_("Отдел"),
+                                  help_text=_("Укажите отдел сотрудника."))
+    hired_date = models.DateField(**NULLABLE, verbose_name=_("Дата приема на работу"),
+                                  help_text=_("Укажите дату приема на работу."))
+    active_task_count = models.PositiveIntegerField(default=0, editable=False,
+                                                    verbose_name=_("Количество активных задач"),
+                                                    help_text=_("Количество задач сотрудника в статусе "
+                                                                "'Новая' или 'В работе'."))
 
     class Meta:
-        verbose_name = "Сотрудник"
-        verbose_name_plural = "Сотрудники"
+        verbose_name = _("Сотрудник")
+        verbose_name_plural = _("Сотрудники")
 
     def __str__(self):
         return f"{self.last_name} {self.first_name} {self.middle_name or ''} - {self.position}"
 
+    def save(self, *args, update_fields=None, **kwargs):
+        # Счетчик активных задач записывает только update_active_task_count. При обычном сохранении
+        # уже сохраненного сотрудника значение счетчика в объекте может быть устаревшим, поэтому его не пишем
+        if (update_fields is None and self.pk is not None and not self._state.adding
+                and not kwargs.get('force_insert')):
+            update_fields = [field.name for field in self._meta.concrete_fields
+                             if not field.primary_key and field.name != 'active_task_count']
+        super().save(*args, update_fields=update_fields, **kwargs)
+
 
 class Task(models.Model):
     """
@@ -54,23 +75,32 @@ class Task(models.Model):
         ('canceled', 'Отменена'),
         ('overdue', 'Просрочена'),
     )
+    STATUS_DISPLAY = dict(STATUS_CHOICES)
 
-    name = models.CharField(max_length=200, verbose_name="Наименование задачи",
-                            help_text="Введите наименование задачи.")
-    description = models.TextField(**NULLABLE, verbose_name="Описание задачи", help_text="Введите описание задачи.")
+    name = models.CharField(max_length=200, verbose_name=_("Наименование задачи"),
+                            help_text=_("Введите наименование задачи."))
+    description = models.TextField(**NULLABLE, verbose_name=_("Описание задачи"),
+                                   help_text=_("Введите описание задачи."))
     parent_task = models.ForeignKey('self', **NULLABLE, on_delete=models.SET_NULL, related_name='subtasks',
-                                    verbose_name="Родительская задача",
-                                    help_text="Выберите родительскую задачу, если задача является зависимой.")
+                                    verbose_name=_("Родительская задача"),
+                                    help_text=_("Выберите родительскую задачу, если задача является зависимой."))
     assigned_to = models.ForeignKey('Employee', **NULLABLE, on_delete=models.SET_NULL, related_name='tasks',
-                                    verbose_name="Исполнитель",
-                                    help_text="Укажите сотрудника, ответственного за выполнение задачи.")
-    due_date = models.DateField(verbose_name="Срок выполнения", help_text="Укажите срок выполнения задачи.")
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new', verbose_name="Статус",
-                              help_text="Выберите статус задачи.")
+                                    verbose_name=_("Исполнитель"),
+                                    help_text=_("Укажите сотрудника, ответственного за выполнение задачи."))
+    due_date = models.DateField(verbose_name=_("Срок выполнения"), help_text=_("Укажите срок выполнения задачи."))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new', verbose_name=_("Статус"),
+                              help_text=_("Выберите статус задачи."))
 
     class Meta:
-        verbose_name = "Задача"
-        verbose_name_plural = "Задачи"
+        verbose_name = _("Задача")
+        verbose_name_plural = _("Задачи")
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['assigned_to', 'status']),
+            models.Index(fields=['parent_task', 'assigned_to']),
+            models.Index(fields=['status', 'due_date']),
+            models.Index(fields=['status', 'parent_task']),
+        ]
 
     def __str__(self):
-        return f"{self.name} - {self.get_status_display()}"
+        return f"{self.name} - {self.STATUS_DISPLAY.get(self.status, self.status)}"
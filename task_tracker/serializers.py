@@ -1,9 +1,27 @@
 import datetime
+import re
+from collections import defaultdict
 
+from django.db.models import Prefetch
 from rest_framework.exceptions import ValidationError
-from rest_framework.fields import SerializerMethodField
-from rest_framework.serializers import ModelSerializer
-from .models import Employee, Task
+from rest_framework.fields import IntegerField, ListField, SerializerMethodField
+from rest_framework.serializers import ListSerializer, ModelSerializer
+from .models import ACTIVE_STATUSES, Employee, Task
+
+# Только буквы любого алфавита, без цифр и знаков подчеркивания
+NAME_PATTERN = re.compile(r'[^\W\d_]+')
+
+
+def validate_name(value, message):
+    """
+    Проверяет, что значение состоит только из букв, иначе выбрасывает ValidationError с указанным сообщением.
+    Значение None не проверяется: для необязательных полей его допускает сам сериализатор.
+    """
+    if value is None:
+        return value
+    if not NAME_PATTERN.fullmatch(value):
+        raise ValidationError(message)
+    return value
 
 
 class EmployeeSerializer(ModelSerializer):
@@ -11,48 +29,79 @@ class EmployeeSerializer(ModelSerializer):
     Сериализатор для модели Employee.
     Включает валидацию данных.
     """
-    active_task_count = SerializerMethodField()
 
-    def get_active_task_count(self, employee):
-        return Task.objects.filter(assigned_to=employee, status__in=['new', 'in_progress']).count()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Дата вычисляется один раз на сериализатор, а не для каждого проверяемого значения
+        self._today = datetime.date.today()
 
     def validate_first_name(self, value):
-        if not value.isalpha():
-            raise ValidationError("Имя должно содержать только буквы.")
-        return value
+        return validate_name(value, "Имя должно содержать только буквы.")
 
     def validate_last_name(self, value):
-        if not value.isalpha():
-            raise ValidationError("Фамилия должна содержать только буквы.")
-        return value
+        return validate_name(value, "Фамилия должна содержать только буквы.")
 
     def validate_middle_name(self, value):
-        if not value.isalpha():
-            raise ValidationError("Отчество должно содержать только буквы.")
-        return value
+        return validate_name(value, "Отчество должно содержать только буквы.")
 
     def validate_hired_date(self, value):
-        if value > datetime.date.today():
+        if value > self._today:
             raise ValidationError("Дата приема на работу не может быть в будущем.")
         return value
 
+    def to_representation(self, employee):
+        # Словарь собирается вручную, см. TaskSummarySerializer
+        return {
+            'id': employee.id,
+            'last_name': employee.last_name,
+            'first_name': employee.first_name,
+            'middle_name': employee.middle_name,
+            'position': employee.position,
+            'department': employee.department,
+            'hired_date': None if employee.hired_date is None else str(employee.hired_date),
+            'active_task_count': employee.active_task_count,
+        }
+
     class Meta:
         model = Employee
         fields = ['id', 'last_name', 'first_name', 'middle_name', 'position', 'department',
                   'hired_date', 'active_task_count']
 
 
+class ParentTaskSerializer(ModelSerializer):
+    """
+    Краткое представление родительской задачи.
+    """
+
+    class Meta:
+        model = Task
+        fields = ['id', 'name', 'due_date']
+
+
 class TaskSummarySerializer(ModelSerializer):
-    parent_task = SerializerMethodField()
+    """
+    Сериализатор для краткого представления задачи с данными о родительской задаче.
+    Queryset должен подгружать родительскую задачу через select_related('parent_task').
 
-    def get_parent_task(self, task):
-        if task.parent_task:
-            return {
-                'id': task.parent_task.id,
-                'name': task.parent_task.name,
-                'due_date': task.parent_task.due_date
-            }
-        return None
+    Сериализатор отдается в больших списках, поэтому to_representation собирает словарь вручную,
+    без обхода полей DRF. Объявленные поля по-прежнему описывают структуру ответа для документации API,
+    а состав словаря должен совпадать с Meta.fields. Так же устроены EmployeeSerializer и TaskListSerializer.
+    """
+    parent_task = ParentTaskSerializer(read_only=True)
+
+    def to_representation(self, task):
+        parent_task = task.parent_task
+        return {
+            'id': task.id,
+            'name': task.name,
+            'due_date': str(task.due_date),
+            'status': task.status,
+            'parent_task': None if parent_task is None else {
+                'id': parent_task.id,
+                'name': parent_task.name,
+                'due_date': str(parent_task.due_date),
+            },
+        }
 
     class Meta:
         model = Task
@@ -64,15 +113,22 @@ class BusyEmployeeSerializer(ModelSerializer):
     Сериализатор для списка занятых сотрудников.
     Включает необходимые поля и список активных задач.
     """
-    tasks = SerializerMethodField()
-    active_task_count = SerializerMethodField()
+    tasks = TaskSummarySerializer(source='active_tasks', many=True, read_only=True)
+    active_task_count = IntegerField(read_only=True)
 
-    def get_tasks(self, employee):
-        tasks = Task.objects.filter(assigned_to=employee, status__in=['new', 'in_progress'])
-        return TaskSummarySerializer(tasks, many=True).data
-
-    def get_active_task_count(self, employee):
-        return Task.objects.filter(assigned_to=employee, status__in=['new', 'in_progress']).count()
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Загружает только выводимые поля сотрудников и подгружает их активные задачи
+        одним запросом в атрибут active_tasks.
+        """
+        active_tasks = Task.objects.filter(status__in=ACTIVE_STATUSES).select_related('parent_task').only(
+            'id', 'name', 'due_date', 'status', 'assigned_to',
+            'parent_task__id', 'parent_task__name', 'parent_task__due_date'
+        )
+        return queryset.only(
+            'id', 'last_name', 'first_name', 'middle_name', 'position', 'hired_date', 'active_task_count'
+        ).prefetch_related(Prefetch('tasks', queryset=active_tasks, to_attr='active_tasks'))
 
     class Meta:
         model = Employee
@@ -87,12 +143,16 @@ class TaskSerializer(ModelSerializer):
     """
     subtasks = SerializerMethodField()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._today = datetime.date.today()
+
     def get_subtasks(self, task):
         # Возвращаем только список ID подзадач
-        return task.subtasks.values_list('id', flat=True)
+        return list(task.subtasks.values_list('id', flat=True))
 
     def validate_due_date(self, value):
-        if value < datetime.date.today():
+        if value < self._today:
             raise ValidationError("Срок выполнения задачи не может быть в прошлом.")
         return value
 
@@ -101,6 +161,60 @@ class TaskSerializer(ModelSerializer):
         fields = ['id', 'name', 'description', 'due_date', 'status', 'parent_task', 'assigned_to', 'subtasks']
 
 
+class TaskListSubtasksSerializer(ListSerializer):
+    """
+    Список задач для TaskListSerializer. Загружает ID подзадач сразу для всех задач списка одним запросом
+    и добавляет их в словарь каждой задачи под ключом 'subtasks'.
+    """
+
+    def to_representation(self, data):
+        tasks = list(data)
+        subtasks = defaultdict(list)
+        if tasks:
+            subtask_ids = Task.objects.filter(
+                parent_task__in=[task['id'] for task in tasks]
+            ).values_list('parent_task_id', 'id')
+            for parent_task_id, subtask_id in subtask_ids:
+                subtasks[parent_task_id].append(subtask_id)
+
+        for task in tasks:
+            task['subtasks'] = subtasks[task['id']]
+        return [self.child.to_representation(task) for task in tasks]
+
+
+class TaskListSerializer(ModelSerializer):
+    """
+    Сериализатор для списка задач. Работает со словарями из queryset.values() без создания объектов модели,
+    формат ответа совпадает с TaskSerializer.
+    """
+    subtasks = ListField(child=IntegerField(), read_only=True)
+
+    @classmethod
+    def get_values_queryset(cls, queryset):
+        """
+        Возвращает queryset словарей только с выводимыми полями задач, которые принимает этот сериализатор.
+        """
+        return queryset.values('id', 'name', 'description', 'due_date', 'status', 'parent_task', 'assigned_to')
+
+    def to_representation(self, task):
+        # Словарь собирается вручную, см. TaskSummarySerializer
+        return {
+            'id': task['id'],
+            'name': task['name'],
+            'description': task['description'],
+            'due_date': str(task['due_date']),
+            'status': task['status'],
+            'parent_task': task['parent_task'],
+            'assigned_to': task['assigned_to'],
+            'subtasks': task['subtasks'],
+        }
+
+    class Meta:
+        model = Task
+        fields = ['id', 'name', 'description', 'due_date', 'status', 'parent_task', 'assigned_to', 'subtasks']
+        list_serializer_class = TaskListSubtasksSerializer
+
+
 class ImportantTaskSerializer(ModelSerializer):
     """
     Сериализатор для отображения важных задач и сотрудников, которые могут их взять.
@@ -112,32 +226,27 @@ class ImportantTaskSerializer(ModelSerializer):
         """
         Возвращает список сотрудников, которые могут взять задачу.
         Сотрудники отбираются по критерию минимальной загруженности или выполнения родительской задачи.
+        Данные о загруженности сотрудников берутся из контекста,
+        который заполняет ImportantTasksListAPIView.get_employees_context.
         """
-        employees = Employee.objects.all()
-        if not employees:
+        min_task_count = self.context['min_task_count']
+        if min_task_count is None:
             return []
 
-        # Определяем минимальное количество задач у сотрудников
-        min_task_count = None
-        for employee in employees:
-            task_count = Task.objects.filter(assigned_to=employee).count()
-            if min_task_count is None or task_count < min_task_count:
-                min_task_count = task_count
+        # Сотрудники, выполняющие задачи, которые зависят от текущей
+        parent_task_employees = self.context['parent_task_employees'].get(task.id, set())
 
         suitable_employees = []
 
         # Отбираем сотрудников, которые могут взять задачу
-        for employee in employees:
-            task_count = Task.objects.filter(assigned_to=employee).count()
-            parent_task_employee = Task.objects.filter(parent_task=task, assigned_to=employee).exists()
-
+        for employee_id, last_name, first_name, middle_name, task_count in self.context['employees']:
             # Если сотрудник имеет минимальную загруженность или выполняет родительскую задачу,
             # и у него не более чем на 2 задачи больше, чем у наименее загруженного сотрудника
-            if task_count == min_task_count or (parent_task_employee and task_count <= min_task_count + 2):
-                employee_name = (f"{employee.last_name} {employee.first_name}"
-                                 f" {employee.middle_name or ''}. ID:{employee.id}").strip()
-                if employee_name not in suitable_employees:
-                    suitable_employees.append(employee_name)
+            if task_count == min_task_count or (
+                    employee_id in parent_task_employees and task_count <= min_task_count + 2):
+                # Имя содержит ID сотрудника, поэтому повторов быть не может
+                suitable_employees.append((f"{last_name} {first_name}"
+                                           f" {middle_name or ''}. ID:{employee_id}").strip())
 
         return suitable_employees
 
@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from task_tracker.cache import invalidate_list_cache
+from task_tracker.models import ACTIVE_STATUSES, Employee, Task
+
+
+def update_active_task_count(*employee_ids):
+    """
+    Пересчитывает количество активных задач у указанных сотрудников одним UPDATE-запросом
+    и сбрасывает кэш списков после фиксации транзакции.
+    Сигналы не срабатывают для bulk_create и QuerySet.update, поэтому после них
+    функцию нужно вызывать вручную: иначе устареют и счетчики, и закэшированные списки.
+    """
+    transaction.on_commit(invalidate_list_cache)
+
+    employee_ids = {employee_id for employee_id in employee_ids if employee_id is not None}
+    if not employee_ids:
+        return
+
+    active_task_count = Task.objects.filter(
+        assigned_to=OuterRef('pk'), status__in=ACTIVE_STATUSES
+    ).order_by().values('assigned_to').annotate(count=Count('pk')).values('count')
+    Employee.objects.filter(pk__in=employee_ids).update(
+        active_task_count=Coalesce(Subquery(active_task_count), 0)
+    )
+
+
+@receiver(pre_save, sender=Task)
+def remember_previous_assignee(sender, instance, **kwargs):
+    """
+    Запоминает исполнителя задачи до сохранения, чтобы пересчитать и его счетчик.
+    """
+    instance._previous_assigned_to_id = None
+    if instance.pk is not None:
+        instance._previous_assigned_to_id = Task.objects.filter(pk=instance.pk).values_list(
+            'assigned_to_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Task)
+def update_active_task_count_on_save(sender, instance, **kwargs):
+    update_active_task_count(instance._previous_assigned_to_id, instance.assigned_to_id)
+
+
+@receiver(post_delete, sender=Task)
+def update_active_task_count_on_delete(sender, instance, **kwargs):
+    update_active_task_count(instance.assigned_to_id)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_list_cache_on_change(sender, **kwargs):
+    """
+    Сбрасывает кэш списков: списки задач и сотрудников зависят от обеих моделей.
+    Версия кэша увеличивается только после фиксации транзакции, иначе параллельный запрос
+    мог бы закэшировать старые данные под новой версией.
+    """
+    transaction.on_commit(invalidate_list_cache)
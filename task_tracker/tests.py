@@ -1,56 +1,105 @@
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.serializers import ModelSerializer
 from rest_framework.test import APITestCase
 from task_tracker.models import Employee, Task
 from users.models import User
-from django.test import TestCase
-from task_tracker.serializers import TaskSummarySerializer
+from django.test import SimpleTestCase, TestCase
+from task_tracker.serializers import EmployeeSerializer, TaskListSerializer, TaskSerializer, TaskSummarySerializer
+from task_tracker.signals import update_active_task_count
 import datetime
 
 
-class EmployeeAPITestCase(APITestCase):
+def make_employee_payload(**overrides):
     """
-    Тесты для проверки операций CRUD с моделью Employee.
+    Возвращает данные валидного сотрудника. Отдельные поля можно переопределить через именованные аргументы.
+    """
+    return {
+        "first_name": "Алексей",
+        "last_name": "Сидоров",
+        "middle_name": "Игоревич",
+        "position": "Менеджер",
+        "department": "Маркетинг",
+        "hired_date": "2022-02-01",
+        **overrides,
+    }
+
+
+def days_from_today(days):
+    """
+    Возвращает дату в формате ISO, смещенную на указанное количество дней от сегодняшней.
+    Сроки задач задаются относительно текущей даты, чтобы не устаревать со временем.
+    """
+    return (datetime.date.today() + datetime.timedelta(days=days)).isoformat()
+
+
+class AuthenticatedAPITestCase(APITestCase):
     """
+    Базовый класс для тестов API. Создает тестового пользователя один раз для всех тестов класса
+    и аутентифицирует клиент перед каждым тестом.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Создаем пользователя без поля username
+        cls.user = User.objects.create(email="test@test.com", password="password123")
 
     def setUp(self):
+        # Кэш списков не откатывается вместе с транзакцией теста, поэтому очищаем его вручную
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+
+class UnauthenticatedAccessAPITestCase(APITestCase):
+    """
+    Тесты для проверки того, что эндпоинты недоступны без аутентификации.
+    """
+    URL_NAMES = ("employee-list", "busy-employees", "task-list", "important-tasks")
+
+    def test_list_endpoints_require_authentication(self):
+        for url_name in self.URL_NAMES:
+            with self.subTest(url_name=url_name):
+                response = self.client.get(reverse(f"task_tracker:{url_name}"))
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class EmployeeAPITestCase(AuthenticatedAPITestCase):
+    """
+    Тесты для проверки операций CRUD с моделью Employee.
+    """
+    INVALID_NAME_CASES = (
+        ("first_name", "Имя должно содержать только буквы."),
+        ("last_name", "Фамилия должна содержать только буквы."),
+        ("middle_name", "Отчество должно содержать только буквы."),
+    )
+
+    @classmethod
+    def setUpTestData(cls):
         """
-        Метод для подготовки тестовых данных. Создает тестового пользователя и аутентифицирует его.
+        Метод для подготовки тестовых данных. Создает тестового пользователя и сотрудника один раз для всех тестов.
         """
-        # Создаем пользователя без поля username
-        self.user = User.objects.create(email="test@test.com", password="password123")
-        self.client.force_authenticate(user=self.user)
+        super().setUpTestData()
 
         # Создаем тестового сотрудника
-        self.employee = Employee.objects.create(
-            first_name="Алексей",
-            last_name="Сидоров",
-            middle_name="Игоревич",
-            position="Менеджер",
-            department="Маркетинг",
-            hired_date="2022-02-01"
-        )
+        cls.employee = Employee.objects.create(**make_employee_payload())
+
+        cls.employee_create_url = reverse("task_tracker:employee-create")
+        cls.employee_list_url = reverse("task_tracker:employee-list")
+        cls.employee_detail_url = reverse("task_tracker:employee-detail", args=(cls.employee.pk,))
+        cls.employee_update_url = reverse("task_tracker:employee-update", args=(cls.employee.pk,))
+        cls.employee_delete_url = reverse("task_tracker:employee-delete", args=(cls.employee.pk,))
 
     def test_employee_create(self):
         """
         Тест создания нового сотрудника.
         Проверяет, что сотрудник успешно создается и количество сотрудников увеличивается.
         """
-        # URL для создания сотрудника
-        url = reverse("task_tracker:employee-create")
-
         # Данные для создания нового сотрудника
-        data = {
-            "first_name": "Алексей",
-            "last_name": "Сидоров",
-            "middle_name": "Игоревич",
-            "position": "Менеджер",
-            "department": "Маркетинг",
-            "hired_date": "2022-02-01"
-        }
+        data = make_employee_payload()
 
         # Отправляем POST-запрос для создания сотрудника
-        response = self.client.post(url, data)
+        response = self.client.post(self.employee_create_url, data)
 
         # Проверяем, что запрос завершился успешно с кодом 201
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -58,85 +107,51 @@ class EmployeeAPITestCase(APITestCase):
         # Проверяем, что количество сотрудников в базе данных увеличилось на 1
         self.assertEqual(Employee.objects.count(), 2)
 
-    def test_employee_invalid_first_name(self):
+    def test_employee_invalid_name(self):
         """
-        Тест валидации: имя должно содержать только буквы.
+        Тест валидации: имя, фамилия и отчество должны содержать только буквы.
         """
-        url = reverse("task_tracker:employee-create")
-        data = {
-            "first_name": "1234",  # Невалидное имя
-            "last_name": "Иванов",
-            "middle_name": "Иванович",
-            "position": "Менеджер",
-            "department": "Маркетинг",
-            "hired_date": "2022-02-01"
-        }
-        response = self.client.post(url, data)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("Имя должно содержать только буквы.", response.json()['first_name'][0])
+        for field, message in self.INVALID_NAME_CASES:
+            with self.subTest(field=field):
+                data = make_employee_payload(**{field: "1234"})  # Невалидное значение
+                response = self.client.post(self.employee_create_url, data)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(message, response.data[field][0])
 
-    def test_employee_invalid_last_name(self):
+    def test_employee_create_without_middle_name(self):
         """
-        Тест валидации: фамилия должна содержать только буквы.
+        Тест создания сотрудника без отчества: значение null для отчества допустимо.
         """
-        url = reverse("task_tracker:employee-create")
-        data = {
-            "first_name": "Иван",
-            "last_name": "1234",  # Невалидная фамилия
-            "middle_name": "Иванович",
-            "position": "Менеджер",
-            "department": "Маркетинг",
-            "hired_date": "2022-02-01"
-        }
-        response = self.client.post(url, data)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("Фамилия должна содержать только буквы.", response.json()['last_name'][0])
+        data = make_employee_payload(middle_name=None)
+        response = self.client.post(self.employee_create_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNone(response.data['middle_name'])
 
-    def test_employee_invalid_middle_name(self):
+    def test_employee_empty_middle_name(self):
         """
-        Тест валидации: отчество должно содержать только буквы.
+        Тест валидации: пустая строка в качестве отчества не допускается.
         """
-        url = reverse("task_tracker:employee-create")
-        data = {
-            "first_name": "Иван",
-            "last_name": "Иванов",
-            "middle_name": "1234",  # Невалидное отчество
-            "position": "Менеджер",
-            "department": "Маркетинг",
-            "hired_date": "2022-02-01"
-        }
-        response = self.client.post(url, data)
+        data = make_employee_payload(middle_name="")
+        response = self.client.post(self.employee_create_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("Отчество должно содержать только буквы.", response.json()['middle_name'][0])
+        self.assertIn("Отчество должно содержать только буквы.", response.data['middle_name'][0])
 
     def test_employee_invalid_hired_date(self):
         """
         Тест валидации: дата приема на работу не может быть в будущем.
         """
-        url = reverse("task_tracker:employee-create")
-        future_date = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
-        data = {
-            "first_name": "Иван",
-            "last_name": "Иванов",
-            "middle_name": "Иванович",
-            "position": "Менеджер",
-            "department": "Маркетинг",
-            "hired_date": future_date  # Будущая дата
-        }
-        response = self.client.post(url, data)
+        data = make_employee_payload(hired_date=days_from_today(1))  # Будущая дата
+        response = self.client.post(self.employee_create_url, data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("Дата приема на работу не может быть в будущем.", response.json()['hired_date'][0])
+        self.assertIn("Дата приема на работу не может быть в будущем.", response.data['hired_date'][0])
 
     def test_employee_retrieve(self):
         """
         Тест получения информации о сотруднике по его ID.
         """
-        # URL для получения сотрудника по ID
-        url = reverse("task_tracker:employee-detail", args=(self.employee.pk,))
-
         # Отправляем GET-запрос для получения данных о сотруднике
-        response = self.client.get(url)
-        data = response.json()
+        response = self.client.get(self.employee_detail_url)
+        data = response.data
 
         # Проверяем, что запрос завершился успешно с кодом 200
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -153,12 +168,11 @@ class EmployeeAPITestCase(APITestCase):
         Тест обновления информации о сотруднике.
         Обновляется отдел сотрудника.
         """
-        url = reverse("task_tracker:employee-update", args=(self.employee.pk,))
         data = {
             "department": "Бухгалтерия"
         }
-        response = self.client.patch(url, data)
-        data = response.json()
+        response = self.client.patch(self.employee_update_url, data)
+        data = response.data
         self.assertEqual(
             response.status_code, status.HTTP_200_OK
         )
@@ -171,8 +185,7 @@ class EmployeeAPITestCase(APITestCase):
         Тест удаления сотрудника.
         Проверяет, что сотрудник успешно удаляется и количество сотрудников уменьшается.
         """
-        url = reverse("task_tracker:employee-delete", args=(self.employee.pk,))
-        response = self.client.delete(url)
+        response = self.client.delete(self.employee_delete_url)
         self.assertEqual(
             response.status_code, status.HTTP_204_NO_CONTENT
         )
@@ -195,9 +208,10 @@ class EmployeeAPITestCase(APITestCase):
             hired_date="2023-03-15"
         )
 
-        url = reverse("task_tracker:employee-list")
-        response = self.client.get(url)
-        data = response.json()
+        # Один запрос: сотрудники вместе со счетчиком активных задач
+        with self.assertNumQueries(1):
+            response = self.client.get(self.employee_list_url)
+        data = response.data
 
         # Проверяем, что запрос завершился успешно с кодом 200
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -214,84 +228,127 @@ class EmployeeAPITestCase(APITestCase):
         self.assertEqual(data[1]['last_name'], "Петров")
 
 
-class BusyEmployeesListAPITestCase(APITestCase):
+class BusyEmployeesListAPITestCase(AuthenticatedAPITestCase):
     """
     Тесты для проверки эндпоинта получения списка сотрудников,
     отсортированных по количеству активных задач и срокам выполнения.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Метод для подготовки тестовых данных. Создает тестового пользователя и несколько сотрудников.
         """
-        self.user = User.objects.create(email="test@test.com", password="password123")
-        self.client.force_authenticate(user=self.user)
+        super().setUpTestData()
+
+        # Создаем нескольких сотрудников. Задачи каждый тест создает сам, если они ему нужны
+        cls.employee1, cls.employee2, cls.employee3 = Employee.objects.bulk_create([
+            Employee(first_name="Иван", last_name="Иванов"),
+            Employee(first_name="Петр", last_name="Петров"),
+            Employee(first_name="Анна", last_name="Сидорова"),
+        ])
 
-        # Создаем нескольких сотрудников
-        self.employee1 = Employee.objects.create(first_name="Иван", last_name="Иванов")
-        self.employee2 = Employee.objects.create(first_name="Петр", last_name="Петров")
-        self.employee3 = Employee.objects.create(first_name="Анна", last_name="Сидорова")
-
-        # Создаем задачи для сотрудников с указанием due_date
-        self.task1 = Task.objects.create(name="Задача 1", assigned_to=self.employee1, status='new',
-                                         due_date="2024-09-01")
-        self.task2 = Task.objects.create(name="Задача 2", assigned_to=self.employee1, status='in_progress',
-                                         due_date="2024-09-10")
-        self.task3 = Task.objects.create(name="Задача 3", assigned_to=self.employee2, status='new',
-                                         due_date="2024-09-15")
-        self.task4 = Task.objects.create(name="Задача 4", assigned_to=self.employee3, status='new',
-                                         due_date="2024-08-01")
-        self.task5 = Task.objects.create(name="Задача 5", assigned_to=self.employee3, status='in_progress',
-                                         due_date="2024-08-15")
+        cls.busy_employees_url = reverse("task_tracker:busy-employees")
+
+    def _create_tasks(self, tasks):
+        """
+        Создает задачи одним запросом и пересчитывает счетчики активных задач сотрудников.
+        """
+        Task.objects.bulk_create(tasks)
+        # bulk_create не отправляет сигналы, поэтому счетчики активных задач пересчитываем явно
+        update_active_task_count(self.employee1.pk, self.employee2.pk, self.employee3.pk)
+
+    def _create_default_tasks(self):
+        """
+        Создает задачи для сотрудников с разным количеством активных задач и сроками выполнения.
+        """
+        self._create_tasks([
+            Task(name="Задача 1", assigned_to=self.employee1, status='new', due_date=days_from_today(32)),
+            Task(name="Задача 2", assigned_to=self.employee1, status='in_progress', due_date=days_from_today(41)),
+            Task(name="Задача 3", assigned_to=self.employee2, status='new', due_date=days_from_today(46)),
+            Task(name="Задача 4", assigned_to=self.employee3, status='new', due_date=days_from_today(1)),
+            Task(name="Задача 5", assigned_to=self.employee3, status='in_progress', due_date=days_from_today(15)),
+        ])
 
     def test_busy_employees_list(self):
         """
         Тест получения списка сотрудников, отсортированных по количеству активных задач
         и по срокам выполнения задач.
         """
-        url = reverse("task_tracker:busy-employees")
-        response = self.client.get(url)
+        self._create_default_tasks()
+
+        # Два запроса: сотрудники и их активные задачи с родительскими задачами
+        with self.assertNumQueries(2):
+            response = self.client.get(self.busy_employees_url)
 
         # Проверяем, что запрос завершился успешно
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Проверяем правильность сортировки сотрудников по количеству активных задач и срокам выполнения
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 3)
 
         # Проверяем, что задачи включены в вывод для каждого сотрудника
-        self.assertEqual(data[0]['first_name'], "Анна")  # У нее 2 задачи, earliest_due_date="2024-08-01"
+        self.assertEqual(data[0]['first_name'], "Анна")  # У нее 2 задачи и самый ранний срок
         self.assertEqual(data[0]['active_task_count'], 2)
         self.assertEqual(len(data[0]['tasks']), 2)
         self.assertEqual(data[0]['tasks'][0]['name'], "Задача 4")
         self.assertEqual(data[0]['tasks'][1]['name'], "Задача 5")
 
-        self.assertEqual(data[1]['first_name'], "Иван")  # У него 2 задачи, earliest_due_date="2024-09-01"
+        self.assertEqual(data[1]['first_name'], "Иван")  # У него 2 задачи, но срок позже, чем у Анны
         self.assertEqual(data[1]['active_task_count'], 2)
         self.assertEqual(len(data[1]['tasks']), 2)
         self.assertEqual(data[1]['tasks'][0]['name'], "Задача 1")
         self.assertEqual(data[1]['tasks'][1]['name'], "Задача 2")
 
-        self.assertEqual(data[2]['first_name'], "Петр")  # У него 1 задача, earliest_due_date="2024-09-15"
+        self.assertEqual(data[2]['first_name'], "Петр")  # У него 1 задача
         self.assertEqual(data[2]['active_task_count'], 1)
         self.assertEqual(len(data[2]['tasks']), 1)
         self.assertEqual(data[2]['tasks'][0]['name'], "Задача 3")
 
+    def test_busy_employees_list_cache(self):
+        """
+        Тест кэширования списка занятых сотрудников: повторный запрос не обращается к базе данных,
+        а изменение задач сбрасывает кэш.
+        """
+        self.client.get(self.busy_employees_url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.busy_employees_url)
+        self.assertEqual(response.data[0]['active_task_count'], 0)
+
+        # Кэш сбрасывается после фиксации транзакции, поэтому выполняем отложенные обработчики сразу
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(name="Задача 1", assigned_to=self.employee3, status='new', due_date=days_from_today(1))
+        response = self.client.get(self.busy_employees_url)
+        self.assertEqual(response.data[0]['first_name'], "Анна")
+        self.assertEqual(response.data[0]['active_task_count'], 1)
+
+    def test_busy_employees_list_cache_after_bulk_create(self):
+        """
+        Тест: пересчет счетчиков после bulk_create сбрасывает кэш списка занятых сотрудников.
+        """
+        self.client.get(self.busy_employees_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_tasks([
+                Task(name="Задача 1", assigned_to=self.employee3, status='new', due_date=days_from_today(1)),
+            ])
+        response = self.client.get(self.busy_employees_url)
+        self.assertEqual(response.data[0]['first_name'], "Анна")
+        self.assertEqual(response.data[0]['active_task_count'], 1)
+
     def test_no_active_tasks(self):
         """
         Тест, когда у сотрудников нет активных задач.
         """
-        # Удаляем все задачи
-        Task.objects.all().delete()
-
-        url = reverse("task_tracker:busy-employees")
-        response = self.client.get(url)
+        response = self.client.get(self.busy_employees_url)
 
         # Проверяем, что запрос завершился успешно
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Все сотрудники должны быть в списке, но без задач
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 3)
         self.assertEqual(data[0]['first_name'], "Иван")
         self.assertEqual(data[0]['active_task_count'], 0)
@@ -310,26 +367,24 @@ class BusyEmployeesListAPITestCase(APITestCase):
         Тест, когда у сотрудников одинаковое количество активных задач.
         Проверяет, что сотрудники с одинаковым количеством активных задач сортируются по срокам выполнения.
         """
-        # Удаляем все существующие задачи, чтобы тесты были изолированы
-        Task.objects.all().delete()
-
         # Создаем задачи с одинаковым количеством активных задач, но с разными сроками выполнения
-        Task.objects.create(name="Задача 1", assigned_to=self.employee1, status='new', due_date="2024-08-05")
-        Task.objects.create(name="Задача 2", assigned_to=self.employee2, status='new', due_date="2024-08-10")
-        Task.objects.create(name="Задача 3", assigned_to=self.employee3, status='new', due_date="2024-08-01")
+        self._create_tasks([
+            Task(name="Задача 1", assigned_to=self.employee1, status='new', due_date=days_from_today(5)),
+            Task(name="Задача 2", assigned_to=self.employee2, status='new', due_date=days_from_today(10)),
+            Task(name="Задача 3", assigned_to=self.employee3, status='new', due_date=days_from_today(1)),
+        ])
 
-        url = reverse("task_tracker:busy-employees")
-        response = self.client.get(url)
+        response = self.client.get(self.busy_employees_url)
 
         # Проверяем, что запрос завершился успешно
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Проверяем, что все сотрудники возвращены и правильно отсортированы
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 3)
-        self.assertEqual(data[0]['first_name'], "Анна")  # У нее earliest_due_date="2024-08-01"
-        self.assertEqual(data[1]['first_name'], "Иван")  # У него earliest_due_date="2024-08-05"
-        self.assertEqual(data[2]['first_name'], "Петр")  # У него earliest_due_date="2024-08-10"
+        self.assertEqual(data[0]['first_name'], "Анна")  # У нее самый ранний срок
+        self.assertEqual(data[1]['first_name'], "Иван")  # У него срок на 4 дня позже
+        self.assertEqual(data[2]['first_name'], "Петр")  # У него самый поздний срок
 
         # Проверяем задачи для каждого сотрудника
         self.assertEqual(len(data[0]['tasks']), 1)
@@ -341,72 +396,97 @@ class BusyEmployeesListAPITestCase(APITestCase):
         self.assertEqual(len(data[2]['tasks']), 1)
         self.assertEqual(data[2]['tasks'][0]['name'], "Задача 2")
 
+    def test_employees_without_active_tasks_are_last(self):
+        """
+        Тест, когда у части сотрудников нет активных задач.
+        Сотрудники без активных задач выводятся после остальных, а завершенные задачи не учитываются в сроках.
+        """
+        self._create_tasks([
+            Task(name="Задача 1", assigned_to=self.employee1, status='completed', due_date=days_from_today(1)),
+            Task(name="Задача 2", assigned_to=self.employee3, status='new', due_date=days_from_today(10)),
+        ])
+
+        response = self.client.get(self.busy_employees_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.data
+        self.assertEqual([employee['first_name'] for employee in data], ["Анна", "Иван", "Петр"])
+        self.assertEqual(data[0]['active_task_count'], 1)
+        self.assertEqual(data[1]['active_task_count'], 0)
+        self.assertEqual(len(data[1]['tasks']), 0)
+
 
-class TaskAPITestCase(APITestCase):
+class TaskAPITestCase(AuthenticatedAPITestCase):
     """
     Тесты для проверки операций CRUD с моделью Task.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Метод для подготовки тестовых данных. Создает тестового пользователя и сотрудника.
         """
-        self.user = User.objects.create(email="test@test.com", password="password123")
-        self.client.force_authenticate(user=self.user)
+        super().setUpTestData()
 
         # Создаем сотрудника, который будет выполнять задачи
-        self.employee = Employee.objects.create(first_name="Иван", last_name="Иванов")
+        cls.employee = Employee.objects.create(first_name="Иван", last_name="Иванов")
+
+        cls.task_create_url = reverse("task_tracker:task-create")
+        cls.task_list_url = reverse("task_tracker:task-list")
 
     def test_task_create(self):
         """
         Тест создания новой задачи.
         """
-        url = reverse("task_tracker:task-create")
         data = {
             "name": "Тестовая задача",
             "description": "Описание задачи",
             "assigned_to": self.employee.id,
-            "due_date": "2024-09-15",
+            "due_date": days_from_today(46),
             "status": "new",
         }
-        response = self.client.post(url, data)
+        response = self.client.post(self.task_create_url, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(Task.objects.all().count(), 1)
-        task = Task.objects.get()
-        self.assertEqual(task.name, data['name'])
-        self.assertEqual(task.description, data['description'])
-        self.assertEqual(task.assigned_to, self.employee)
-        self.assertEqual(str(task.due_date), data['due_date'])
-        self.assertEqual(task.status, data['status'])
+        self.assertEqual(Task.objects.count(), 1)
+
+        # Проверяем созданную задачу по данным ответа, без повторного запроса к базе
+        self.assertEqual(response.data['name'], data['name'])
+        self.assertEqual(response.data['description'], data['description'])
+        self.assertEqual(response.data['assigned_to'], self.employee.id)
+        self.assertEqual(response.data['due_date'], data['due_date'])
+        self.assertEqual(response.data['status'], data['status'])
 
     def test_task_invalid_due_date(self):
         """
         Тест валидации: срок выполнения задачи не может быть в прошлом.
         """
-        url = reverse("task_tracker:task-create")
-        past_date = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
         data = {
             "name": "Тестовая задача",
             "description": "Описание задачи",
             "assigned_to": self.employee.id,
-            "due_date": past_date,  # Прошедшая дата
+            "due_date": days_from_today(-1),  # Прошедшая дата
             "status": "new",
         }
-        response = self.client.post(url, data)
+        response = self.client.post(self.task_create_url, data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("Срок выполнения задачи не может быть в прошлом.", response.json()['due_date'][0])
+        self.assertIn("Срок выполнения задачи не может быть в прошлом.", response.data['due_date'][0])
 
     def test_task_retrieve(self):
         """
         Тест получения информации о задаче по ее ID.
         """
-        task = Task.objects.create(name="Задача 1", assigned_to=self.employee, due_date="2024-09-01", status="new")
+        task = Task.objects.create(
+            name="Задача 1",
+            assigned_to=self.employee,
+            due_date=days_from_today(32),
+            status="new"
+        )
 
         url = reverse("task_tracker:task-detail", args=(task.pk,))
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        data = response.json()
+        data = response.data
         self.assertEqual(data['name'], task.name)
         self.assertEqual(data['assigned_to'], self.employee.id)
         self.assertEqual(data['status'], task.status)
@@ -416,7 +496,12 @@ class TaskAPITestCase(APITestCase):
         Тест обновления данных задачи.
         """
         # Создаем тестовую задачу
-        task = Task.objects.create(name="Задача 1", assigned_to=self.employee, due_date="2024-09-01", status="new")
+        task = Task.objects.create(
+            name="Задача 1",
+            assigned_to=self.employee,
+            due_date=days_from_today(32),
+            status="new"
+        )
 
         # URL для обновления задачи
         url = reverse("task_tracker:task-update", args=(task.pk,))
@@ -429,7 +514,7 @@ class TaskAPITestCase(APITestCase):
 
         # Отправляем PATCH-запрос для обновления задачи
         response = self.client.patch(url, data)
-        data = response.json()
+        data = response.data
 
         # Проверяем, что запрос завершился успешно с кодом 200
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -444,7 +529,12 @@ class TaskAPITestCase(APITestCase):
         """
         Тест удаления задачи.
         """
-        task = Task.objects.create(name="Задача 1", assigned_to=self.employee, due_date="2024-09-01", status="new")
+        task = Task.objects.create(
+            name="Задача 1",
+            assigned_to=self.employee,
+            due_date=days_from_today(32),
+            status="new"
+        )
 
         url = reverse("task_tracker:task-delete", args=(task.pk,))
         response = self.client.delete(url)
@@ -455,31 +545,63 @@ class TaskAPITestCase(APITestCase):
         """
         Тест получения списка задач.
         """
-        Task.objects.create(name="Задача 1", assigned_to=self.employee, due_date="2024-09-01", status="new")
-        Task.objects.create(name="Задача 2", assigned_to=self.employee, due_date="2024-09-15", status="in_progress")
+        task = Task.objects.create(
+            name="Задача 1",
+            assigned_to=self.employee,
+            due_date=days_from_today(32),
+            status="new"
+        )
+        Task.objects.create(
+            name="Задача 2",
+            parent_task=task,
+            assigned_to=self.employee,
+            due_date=days_from_today(46),
+            status="in_progress"
+        )
 
-        url = reverse("task_tracker:task-list")
-        response = self.client.get(url)
+        # Два запроса: задачи и ID их подзадач
+        with self.assertNumQueries(2):
+            response = self.client.get(self.task_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 2)
         self.assertEqual(data[0]['name'], "Задача 1")
         self.assertEqual(data[1]['name'], "Задача 2")
 
+        # Элементы списка имеют тот же формат, что и ответ для одной задачи
+        self.assertEqual(data[0], TaskSerializer(task).data)
+
+    def test_task_list_cache(self):
+        """
+        Тест кэширования списка задач: повторный запрос не обращается к базе данных,
+        а изменение задач сбрасывает кэш.
+        """
+        Task.objects.create(name="Задача 1", assigned_to=self.employee, due_date=days_from_today(32), status="new")
+        self.client.get(self.task_list_url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.task_list_url)
+        self.assertEqual(len(response.data), 1)
+
+        # Кэш сбрасывается после фиксации транзакции, поэтому выполняем отложенные обработчики сразу
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(name="Задача 2", assigned_to=self.employee, due_date=days_from_today(46), status="new")
+        response = self.client.get(self.task_list_url)
+        self.assertEqual(len(response.data), 2)
+
     def test_task_list_with_invalid_filter(self):
         """
         Тест фильтрации по недопустимому полю.
         """
-        url = reverse("task_tracker:task-list")
         # Добавляем недопустимый параметр фильтрации `invalid_field`
-        response = self.client.get(url, {'invalid_field': 'some_value'})
+        response = self.client.get(self.task_list_url, {'invalid_field': 'some_value'})
 
         # Ожидаем, что вернется ошибка 400 Bad Request
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
         # Проверяем, что ответ представляет собой список с сообщением об ошибке
-        error_message = response.json()
+        error_message = response.data
         self.assertIsInstance(error_message, list)
         self.assertTrue(any("Фильтрация по полю(-ям)" in msg for msg in error_message))
 
@@ -491,25 +613,47 @@ class TaskAPITestCase(APITestCase):
         parent_task = Task.objects.create(
             name="Родительская задача",
             assigned_to=self.employee,
-            due_date="2024-09-01",
+            due_date=days_from_today(32),
             status="new"
         )
-        subtask = Task.objects.create(
+        Task.objects.create(
             name="Подзадача",
             parent_task=parent_task,
             assigned_to=self.employee,
-            due_date="2024-09-02",
+            due_date=days_from_today(33),
             status="new"
         )
 
-        url = reverse("task_tracker:task-list")
-        response = self.client.get(url, {'subtasks': 'true'})
+        response = self.client.get(self.task_list_url, {'subtasks': 'true'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 1)  # Ожидаем, что будет возвращена только родительская задача
         self.assertEqual(data[0]['id'], parent_task.id)
 
+    def test_task_list_with_subtasks_filter_true_multiple_subtasks(self):
+        """
+        Тест фильтрации subtasks=true: задача с несколькими подзадачами возвращается один раз.
+        """
+        parent_task = Task.objects.create(
+            name="Родительская задача",
+            assigned_to=self.employee,
+            due_date=days_from_today(32),
+            status="new"
+        )
+        Task.objects.bulk_create([
+            Task(name="Подзадача 1", parent_task=parent_task, due_date=days_from_today(33), status="new"),
+            Task(name="Подзадача 2", parent_task=parent_task, due_date=days_from_today(34), status="new"),
+        ])
+
+        response = self.client.get(self.task_list_url, {'subtasks': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.data
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['id'], parent_task.id)
+        self.assertEqual(len(data[0]['subtasks']), 2)
+
     def test_task_list_with_subtasks_filter_false(self):
         """
         Тест фильтрации задач, у которых нет подзадач (subtasks=false).
@@ -517,18 +661,16 @@ class TaskAPITestCase(APITestCase):
         task_without_subtasks = Task.objects.create(
             name="Задача без подзадач",
             assigned_to=self.employee,
-            due_date="2024-09-05",
+            due_date=days_from_today(36),
             status="new"
         )
 
-        url = reverse("task_tracker:task-list")
-        response = self.client.get(url, {'subtasks': 'false'})
+        response = self.client.get(self.task_list_url, {'subtasks': 'false'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 1)  # Должны быть задачи без подзадач
-        task_ids = [task['id'] for task in data]
-        self.assertIn(task_without_subtasks.id, task_ids)
+        self.assertEqual(data[0]['id'], task_without_subtasks.id)
 
     def test_task_list_with_has_parent_filter_true(self):
         """
@@ -537,22 +679,21 @@ class TaskAPITestCase(APITestCase):
         parent_task = Task.objects.create(
             name="Родительская задача",
             assigned_to=self.employee,
-            due_date="2024-09-01",
+            due_date=days_from_today(32),
             status="new"
         )
         subtask = Task.objects.create(
             name="Подзадача",
             parent_task=parent_task,
             assigned_to=self.employee,
-            due_date="2024-09-02",
+            due_date=days_from_today(33),
             status="new"
         )
 
-        url = reverse("task_tracker:task-list")
-        response = self.client.get(url, {'has_parent': 'true'})
+        response = self.client.get(self.task_list_url, {'has_parent': 'true'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 1)  # Ожидаем, что будет возвращена только подзадача
         self.assertEqual(data[0]['id'], subtask.id)
 
@@ -563,75 +704,77 @@ class TaskAPITestCase(APITestCase):
         parent_task = Task.objects.create(
             name="Родительская задача",
             assigned_to=self.employee,
-            due_date="2024-09-01",
+            due_date=days_from_today(32),
             status="new"
         )
         task_without_subtasks = Task.objects.create(
             name="Задача без подзадач",
             assigned_to=self.employee,
-            due_date="2024-09-05",
+            due_date=days_from_today(36),
             status="new"
         )
 
-        url = reverse("task_tracker:task-list")
-        response = self.client.get(url, {'has_parent': 'false'})
+        response = self.client.get(self.task_list_url, {'has_parent': 'false'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 2)  # Должны быть задачи без родительской задачи
         task_ids = [task['id'] for task in data]
         self.assertIn(parent_task.id, task_ids)
         self.assertIn(task_without_subtasks.id, task_ids)
 
 
-class ImportantTasksListAPITestCase(APITestCase):
+class ImportantTasksListAPITestCase(AuthenticatedAPITestCase):
     """
     Тесты для проверки эндпоинта получения списка важных задач.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Метод для подготовки тестовых данных. Создает тестового пользователя, сотрудников и задачи.
         """
-        self.user = User.objects.create(email="test@test.com", password="password123")
-        self.client.force_authenticate(user=self.user)
+        super().setUpTestData()
 
         # Создаем сотрудника
-        self.employee = Employee.objects.create(first_name="Иван", last_name="Иванов")
+        cls.employee = Employee.objects.create(first_name="Иван", last_name="Иванов")
 
         # Создаем задачи
-        self.parent_task_in_progress = Task.objects.create(
+        cls.parent_task_in_progress = Task.objects.create(
             name="Родительская задача в работе",
-            assigned_to=self.employee,
-            due_date="2024-09-01",
+            assigned_to=cls.employee,
+            due_date=days_from_today(32),
             status="in_progress"
         )
-        self.important_task = Task.objects.create(
+        cls.important_task = Task.objects.create(
             name="Важная задача",
-            parent_task=self.parent_task_in_progress,
-            assigned_to=self.employee,
-            due_date="2024-09-10",
+            parent_task=cls.parent_task_in_progress,
+            assigned_to=cls.employee,
+            due_date=days_from_today(41),
             status="new"
         )
-        self.unimportant_task = Task.objects.create(
+        cls.unimportant_task = Task.objects.create(
             name="Неважная задача",
-            assigned_to=self.employee,
-            due_date="2024-09-15",
+            assigned_to=cls.employee,
+            due_date=days_from_today(46),
             status="new"
         )
 
+        cls.important_tasks_url = reverse("task_tracker:important-tasks")
+
     def test_important_tasks_list(self):
         """
         Тест получения списка важных задач.
         """
-        url = reverse("task_tracker:important-tasks")
-        response = self.client.get(url)
+        # Три запроса: важные задачи, загруженность сотрудников и исполнители зависимых задач
+        with self.assertNumQueries(3):
+            response = self.client.get(self.important_tasks_url)
 
         # Проверяем, что запрос завершился успешно
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Проверяем, что список задач содержит только важные задачи
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]['name'], "Важная задача")
 
@@ -643,14 +786,13 @@ class ImportantTasksListAPITestCase(APITestCase):
         self.parent_task_in_progress.status = "completed"
         self.parent_task_in_progress.save()
 
-        url = reverse("task_tracker:important-tasks")
-        response = self.client.get(url)
+        response = self.client.get(self.important_tasks_url)
 
         # Проверяем, что запрос завершился успешно
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Проверяем, что список задач пуст
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data), 0)
 
     def test_no_employees_available(self):
@@ -660,20 +802,99 @@ class ImportantTasksListAPITestCase(APITestCase):
         # Удаляем всех сотрудников из базы данных
         Employee.objects.all().delete()
 
-        url = reverse("task_tracker:important-tasks")
-        response = self.client.get(url)
+        response = self.client.get(self.important_tasks_url)
 
         # Проверяем, что запрос завершился успешно
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Проверяем, что список задач пуст, так как некому их выполнять
-        data = response.json()
+        data = response.data
         self.assertEqual(len(data[0]['potential_employees']), 0)
 
 
-class EmployeeModelTest(TestCase):
+class EmployeeActiveTaskCountTest(TestCase):
+    """
+    Тесты для проверки счетчика активных задач сотрудника, который обновляется сигналами.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee1 = Employee.objects.create(first_name="Иван", last_name="Иванов")
+        cls.employee2 = Employee.objects.create(first_name="Петр", last_name="Петров")
+        cls.task = Task.objects.create(name="Задача", assigned_to=cls.employee1, status="new",
+                                       due_date="2024-09-01")
+
+    def assertActiveTaskCounts(self, employee1_count, employee2_count):
+        self.employee1.refresh_from_db()
+        self.employee2.refresh_from_db()
+        self.assertEqual(self.employee1.active_task_count, employee1_count)
+        self.assertEqual(self.employee2.active_task_count, employee2_count)
+
+    def test_task_create(self):
+        """
+        Тест увеличения счетчика при создании активной задачи.
+        """
+        self.assertActiveTaskCounts(1, 0)
+
+    def test_task_status_change(self):
+        """
+        Тест изменения счетчика при переходе задачи в неактивный статус и обратно.
+        """
+        self.task.status = "completed"
+        self.task.save()
+        self.assertActiveTaskCounts(0, 0)
+
+        self.task.status = "in_progress"
+        self.task.save()
+        self.assertActiveTaskCounts(1, 0)
+
+    def test_task_reassign(self):
+        """
+        Тест пересчета счетчиков у прежнего и нового исполнителя при переназначении задачи.
+        """
+        self.task.assigned_to = self.employee2
+        self.task.save()
+        self.assertActiveTaskCounts(0, 1)
+
+    def test_task_delete(self):
+        """
+        Тест уменьшения счетчика при удалении задачи.
+        """
+        self.task.delete()
+        self.assertActiveTaskCounts(0, 0)
+
+    def test_employee_save_keeps_counter(self):
+        """
+        Тест: сохранение загруженного ранее сотрудника не перезаписывает счетчик устаревшим значением.
+        """
+        stale_employee = Employee.objects.get(pk=self.employee1.pk)
+        Task.objects.create(name="Задача 2", assigned_to=self.employee1, status="new", due_date="2024-09-02")
+
+        stale_employee.position = "Разработчик"
+        stale_employee.save()
+
+        self.assertActiveTaskCounts(2, 0)
+        self.assertEqual(self.employee1.position, "Разработчик")
+
+    def test_employee_copy_inserts_new_row(self):
+        """
+        Тест: сохранение сотрудника со сброшенным первичным ключом создает новую запись.
+        """
+        employee = Employee.objects.get(pk=self.employee1.pk)
+        employee.pk = None
+        employee.save()
+
+        self.assertNotEqual(employee.pk, self.employee1.pk)
+        self.assertEqual(Employee.objects.count(), 3)
+
+
+class EmployeeModelTest(SimpleTestCase):
+    """
+    Тесты строкового представления модели Employee. Обращения к базе данных не требуются.
+    """
+
     def setUp(self):
-        self.employee = Employee.objects.create(
+        self.employee = Employee(
             first_name="Иван",
             last_name="Иванов",
             middle_name="Сидорович",
@@ -689,14 +910,18 @@ class EmployeeModelTest(TestCase):
         self.assertEqual(str(self.employee), expected_str)
 
 
-class TaskModelTest(TestCase):
+class TaskModelTest(SimpleTestCase):
+    """
+    Тесты строкового представления модели Task. Обращения к базе данных не требуются.
+    """
+
     def setUp(self):
-        self.employee = Employee.objects.create(
+        self.employee = Employee(
             first_name="Петр",
             last_name="Петров",
             position="Менеджер"
         )
-        self.task = Task.objects.create(
+        self.task = Task(
             name="Тестовая задача",
             assigned_to=self.employee,
             status="in_progress",
@@ -710,29 +935,75 @@ class TaskModelTest(TestCase):
         self.assertEqual(str(self.task), expected_str)
 
 
-class TaskSummarySerializerTest(TestCase):
+class EmployeeSerializerTest(SimpleTestCase):
+    """
+    Тесты сериализатора EmployeeSerializer на несохраненных объектах без обращения к базе данных.
+    """
+
+    def test_representation_matches_fields(self):
+        """
+        Тест: собранный вручную словарь совпадает с результатом стандартной сериализации полей DRF.
+        """
+        employees = (
+            Employee(id=1, first_name="Иван", last_name="Иванов", middle_name="Иванович", position="Менеджер",
+                     department="Маркетинг", hired_date=datetime.date(2022, 2, 1), active_task_count=2),
+            Employee(id=2, first_name="Петр", last_name="Петров", position="Разработчик"),
+        )
+        for employee in employees:
+            with self.subTest(employee=employee.id):
+                serializer = EmployeeSerializer(employee)
+                self.assertEqual(serializer.data, ModelSerializer.to_representation(serializer, employee))
+
+
+class TaskListSerializerTest(TestCase):
+    """
+    Тесты сериализатора TaskListSerializer.
+    """
+
+    def test_representation_matches_task_serializer(self):
+        """
+        Тест: задачи в списке выводятся в том же формате, что и в TaskSerializer.
+        """
+        employee = Employee.objects.create(first_name="Иван", last_name="Иванов")
+        parent_task = Task.objects.create(name="Родительская задача", description="Описание", assigned_to=employee,
+                                          due_date="2024-09-01", status="in_progress")
+        Task.objects.create(name="Подзадача", parent_task=parent_task, due_date="2024-09-02", status="new")
+
+        tasks = Task.objects.all()
+        data = TaskListSerializer(TaskListSerializer.get_values_queryset(tasks), many=True).data
+        self.assertEqual(data, [TaskSerializer(task).data for task in tasks])
+
+
+class TaskSummarySerializerTest(SimpleTestCase):
+    """
+    Тесты сериализатора TaskSummarySerializer на несохраненных объектах без обращения к базе данных.
+    """
+
     def setUp(self):
-        self.employee = Employee.objects.create(
+        self.employee = Employee(
+            id=1,
             first_name="Иван",
             last_name="Петров",
             position="Разработчик"
         )
 
         # Создаем родительскую задачу
-        self.parent_task = Task.objects.create(
+        self.parent_task = Task(
+            id=1,
             name="Родительская задача",
             assigned_to=self.employee,
             status="new",
-            due_date="2024-09-01"
+            due_date=datetime.date(2024, 9, 1)
         )
 
         # Создаем задачу, у которой есть родительская задача
-        self.task = Task.objects.create(
+        self.task = Task(
+            id=2,
             name="Зависимая задача",
             parent_task=self.parent_task,
             assigned_to=self.employee,
             status="in_progress",
-            due_date="2024-09-10"
+            due_date=datetime.date(2024, 9, 10)
         )
 
     def test_get_parent_task(self):
@@ -742,4 +1013,13 @@ class TaskSummarySerializerTest(TestCase):
         # Проверяем, что родительская задача возвращается корректно
         self.assertEqual(serialized_data['parent_task']['id'], self.parent_task.id)
         self.assertEqual(serialized_data['parent_task']['name'], self.parent_task.name)
-        self.assertEqual(serialized_data['parent_task']['due_date'], str(self.parent_task.due_date))
+        self.assertEqual(serialized_data['parent_task']['due_date'], "2024-09-01")
+
+    def test_representation_matches_fields(self):
+        """
+        Тест: собранный вручную словарь совпадает с результатом стандартной сериализации полей DRF.
+        """
+        for task in (self.task, self.parent_task):
+            with self.subTest(task=task.id):
+                serializer = TaskSummarySerializer(task)
+                self.assertEqual(serializer.data, ModelSerializer.to_representation(serializer, task))
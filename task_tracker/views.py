@@ -1,122 +1,115 @@
+from collections import defaultdict
+
+from django.db.models import Count, Exists, F, Min, OuterRef, Q
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, DestroyAPIView
 from rest_framework.permissions import IsAuthenticated
-from .models import Employee, Task
-from .serializers import EmployeeSerializer, TaskSerializer, ImportantTaskSerializer, BusyEmployeeSerializer
+from rest_framework.response import Response
+from .cache import CachedListMixin
+from .models import ACTIVE_STATUSES, Employee, Task
+from .serializers import (EmployeeSerializer, TaskSerializer, TaskListSerializer, ImportantTaskSerializer,
+                          BusyEmployeeSerializer)
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+# Значения булевых параметров запроса. Неизвестные значения игнорируются, и фильтр не применяется
+_BOOL_MAP = {'true': True, '1': True, 'false': False, '0': False}
+
+
+class AuthenticatedAPIViewMixin:
+    """
+    Примесь для контроллеров, доступных только аутентифицированным пользователям.
+    """
+    permission_classes = (IsAuthenticated,)
+
 
-class EmployeeCreateAPIView(CreateAPIView):
+class EmployeeCreateAPIView(AuthenticatedAPIViewMixin, CreateAPIView):
     """
     Контроллер создания нового сотрудника.
     """
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
-    permission_classes = [IsAuthenticated]
 
 
-class EmployeeListAPIView(ListAPIView):
+class EmployeeListAPIView(AuthenticatedAPIViewMixin, CachedListMixin, ListAPIView):
     """
     Контроллер для получения списка всех сотрудников.
     """
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
-    permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['position', 'department', 'hired_date']
 
 
-class EmployeeRetrieveAPIView(RetrieveAPIView):
+class EmployeeRetrieveAPIView(AuthenticatedAPIViewMixin, RetrieveAPIView):
     """
     Контроллер для получения одного сотрудника по указанному id.
     """
     queryset = Employee.objects.all()
     serializer_class = BusyEmployeeSerializer
-    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
 
 
-class EmployeeUpdateAPIView(UpdateAPIView):
+class EmployeeUpdateAPIView(AuthenticatedAPIViewMixin, UpdateAPIView):
     """
     Контроллер для обновления данных одного сотрудника по указанному id.
     """
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
-    permission_classes = [IsAuthenticated]
 
 
-class EmployeeDestroyAPIView(DestroyAPIView):
+class EmployeeDestroyAPIView(AuthenticatedAPIViewMixin, DestroyAPIView):
     """
     Контроллер для удаления одного сотрудника по указанному id.
     """
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
-    permission_classes = [IsAuthenticated]
 
 
-class BusyEmployeesListAPIView(ListAPIView):
+class BusyEmployeesListAPIView(AuthenticatedAPIViewMixin, CachedListMixin, ListAPIView):
     """
     Эндпоинт для получения списка сотрудников, отсортированных по количеству активных задач
     и по срокам выполнения задач.
     """
     serializer_class = BusyEmployeeSerializer
-    permission_classes = [IsAuthenticated]
+    cache_timeout = 30
 
     def get_queryset(self):
         """
         Возвращает список сотрудников с их задачами, отсортированных по количеству активных задач.
         Активные задачи — это задачи со статусом 'new' или 'in_progress'.
         """
-        employees = Employee.objects.all()
-
-        employee_task_data = []
-        for employee in employees:
-            active_tasks = Task.objects.filter(assigned_to=employee, status__in=['new', 'in_progress'])
-            active_task_count = active_tasks.count()
-
-            # Находим самую раннюю дату выполнения задач
-            earliest_due_date = None
-            for task in active_tasks:
-                if earliest_due_date is None or task.due_date < earliest_due_date:
-                    earliest_due_date = task.due_date
-
-            # Добавляем данные в список
-            employee_task_data.append({
-                'employee': employee,
-                'tasks': active_tasks,
-                'active_task_count': active_task_count,
-                'earliest_due_date': earliest_due_date,
-            })
-
-        # Сортируем сотрудников сначала по количеству задач, затем по самой ранней дате выполнения задач
-        sorted_employee_data = sorted(
-            employee_task_data,
-            key=lambda x: (-x['active_task_count'], x['earliest_due_date'] or '9999-12-31')
+        active_tasks_filter = Q(tasks__status__in=ACTIVE_STATUSES)
+        employees = Employee.objects.annotate(
+            earliest_due_date=Min('tasks__due_date', filter=active_tasks_filter)
+        ).order_by(
+            # Сначала по количеству задач, затем по самой ранней дате выполнения; сотрудники без задач в конце
+            '-active_task_count', F('earliest_due_date').asc(nulls_last=True), 'id'
         )
+        return self.get_serializer_class().setup_eager_loading(employees)
 
-        # Возвращаем отсортированный список сотрудников
-        return [data['employee'] for data in sorted_employee_data]
 
-
-class TaskCreateAPIView(CreateAPIView):
+class TaskCreateAPIView(AuthenticatedAPIViewMixin, CreateAPIView):
     """
     Контроллер создания новой задачи.
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
-    permission_classes = [IsAuthenticated]
 
 
-class TaskListAPIView(ListAPIView):
+class TaskListAPIView(AuthenticatedAPIViewMixin, CachedListMixin, ListAPIView):
     """
     Контроллер для получения списка всех задач.
     """
-    queryset = Task.objects.all().order_by('id')
-    serializer_class = TaskSerializer
-    permission_classes = [IsAuthenticated]
+    queryset = Task.objects.all()
+    serializer_class = TaskListSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['assigned_to', 'status', 'parent_task', 'due_date']
+    # Все допустимые параметры запроса: поля фильтрации и фильтры по подзадачам и родительской задаче
+    _ALLOWED_FILTERS = frozenset(filterset_fields) | {'subtasks', 'has_parent'}
 
     @swagger_auto_schema(
         operation_description="Получение списка задач с возможностью фильтрации по параметрам",
@@ -138,79 +131,114 @@ class TaskListAPIView(ListAPIView):
         return self.list(request, *args, **kwargs)
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = self.get_serializer_class().get_values_queryset(super().get_queryset())
 
         # Проверка на допустимость фильтров
-        allowed_filters = set(self.filterset_fields)
-        requested_filters = set(self.request.query_params.keys()) - {'subtasks', 'has_parent'}
-        invalid_filters = requested_filters - allowed_filters
+        invalid_filters = self.request.query_params.keys() - self._ALLOWED_FILTERS
 
         if invalid_filters:
             raise ValidationError(f"Фильтрация по полю(-ям) {', '.join(invalid_filters)} невозможна. "
-                                  f"Доступные поля для фильтрации: {', '.join(allowed_filters)}")
+                                  f"Доступные поля для фильтрации: {', '.join(self.filterset_fields)}")
 
         # Фильтрация по наличию подзадач
-        subtasks_param = self.request.query_params.get('subtasks')
-        if subtasks_param is not None:
-            if subtasks_param.lower() in ('true', '1'):
-                queryset = queryset.filter(subtasks__isnull=False).distinct()
-            elif subtasks_param.lower() in ('false', '0'):
-                queryset = queryset.filter(subtasks__isnull=True).distinct()
+        has_subtasks = _BOOL_MAP.get(self.request.query_params.get('subtasks', '').lower())
+        if has_subtasks is not None:
+            # Подзапрос EXISTS не размножает строки задач, поэтому DISTINCT не нужен
+            subtasks_exist = Exists(Task.objects.filter(parent_task=OuterRef('pk')))
+            queryset = queryset.filter(subtasks_exist if has_subtasks else ~subtasks_exist)
 
         # Фильтрация по наличию родительской задачи
-        has_parent_param = self.request.query_params.get('has_parent')
-        if has_parent_param is not None:
-            if has_parent_param.lower() in ('true', '1'):
-                queryset = queryset.filter(parent_task__isnull=False)
-            elif has_parent_param.lower() in ('false', '0'):
-                queryset = queryset.filter(parent_task__isnull=True)
+        has_parent = _BOOL_MAP.get(self.request.query_params.get('has_parent', '').lower())
+        if has_parent is not None:
+            queryset = queryset.filter(parent_task__isnull=not has_parent)
 
         return queryset
 
 
-class TaskRetrieveAPIView(RetrieveAPIView):
+class TaskRetrieveAPIView(AuthenticatedAPIViewMixin, RetrieveAPIView):
     """
     Контроллер для получения одной задачи по указанному id.
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
-    permission_classes = [IsAuthenticated]
 
 
-class TaskUpdateAPIView(UpdateAPIView):
+class TaskUpdateAPIView(AuthenticatedAPIViewMixin, UpdateAPIView):
     """
     Контроллер для обновления данных одной задачи по указанному id.
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
-    permission_classes = [IsAuthenticated]
 
 
-class TaskDestroyAPIView(DestroyAPIView):
+class TaskDestroyAPIView(AuthenticatedAPIViewMixin, DestroyAPIView):
     """
     Контроллер для удаления одной задачи по указанному id.
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
-    permission_classes = [IsAuthenticated]
 
 
-class ImportantTasksListAPIView(ListAPIView):
+class ImportantTasksListAPIView(AuthenticatedAPIViewMixin, ListAPIView):
     """
     Эндпоинт для получения списка важных задач, которые не взяты в работу,
     но от которых зависят другие задачи, находящиеся в работе.
     """
     serializer_class = ImportantTaskSerializer
-    permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """
         Возвращает список задач, которые не взяты в работу (статус 'new'),
         но от которых зависят другие задачи, находящиеся в работе.
         """
+        # Родительская задача нужна только для фильтрации, а сериализатор выводит лишь эти поля
         important_tasks = Task.objects.filter(
             status='new',
             parent_task__status='in_progress'
-        )
+        ).only('id', 'name', 'due_date')
 
         return important_tasks
+
+    def list(self, request, *args, **kwargs):
+        """
+        Сначала загружает важные задачи, затем одним проходом собирает данные о сотрудниках
+        сразу для всех полученных задач и передает их сериализатору через контекст.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        tasks = list(queryset if page is None else page)
+
+        context = self.get_serializer_context()
+        context.update(self.get_employees_context(tasks))
+        serializer = self.get_serializer_class()(tasks, many=True, context=context)
+
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    @staticmethod
+    def get_employees_context(tasks):
+        """
+        Возвращает данные о загруженности сотрудников, общие для всех переданных задач,
+        чтобы не пересчитывать их для каждой задачи.
+        """
+        # Для формирования списка нужны только имена и загруженность, поэтому модели не создаем
+        employees = list(Employee.objects.annotate(task_count=Count('tasks')).values_list(
+            'id', 'last_name', 'first_name', 'middle_name', 'task_count'
+        ))
+
+        # Для каждой важной задачи собираем сотрудников, выполняющих зависящие от нее задачи.
+        # Если сотрудников или задач нет, этот запрос не нужен.
+        parent_task_employees = defaultdict(set)
+        if employees and tasks:
+            dependent_tasks = Task.objects.filter(
+                parent_task__in=[task.id for task in tasks], assigned_to__isnull=False
+            ).values_list('parent_task_id', 'assigned_to_id')
+            for parent_task_id, assigned_to_id in dependent_tasks:
+                parent_task_employees[parent_task_id].add(assigned_to_id)
+
+        return {
+            'employees': employees,
+            'min_task_count': min((task_count for *_, task_count in employees), default=None),
+            'parent_task_employees': parent_task_employees,
+        }
@@ -1,11 +1,11 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from users.models import User
 from users.serializers import UserSerializer
 
 
-class UserModelTest(TestCase):
+class UserModelTest(SimpleTestCase):
     """
-    Тесты для проверки модели User.
+    Тесты для проверки модели User на несохраненном объекте без обращения к базе данных.
     """
 
     def test_user_str(self):
@@ -13,7 +13,7 @@ class UserModelTest(TestCase):
         Тестирует строковое представление модели User.
         """
         # Создаем тестового пользователя
-        user = User.objects.create(email="test@example.com")
+        user = User(email="test@example.com")
 
         # Проверяем, что строковое представление возвращает email пользователя
         self.assertEqual(str(user), "test@example.com")
@@ -24,11 +24,12 @@ class UserSerializerTest(TestCase):
     Тесты для проверки сериализатора UserSerializer.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
-        Метод для подготовки тестовых данных. Создаем тестового пользователя.
+        Метод для подготовки тестовых данных. Создаем тестового пользователя один раз для всех тестов.
         """
-        self.user = User.objects.create(
+        cls.user = User.objects.create(
             email="test@example.com",
             first_name="Иван",
             last_name="Иванов"